@@ -1,16 +1,22 @@
 # from contextlib import asynccontextmanager
 import time
+import uuid
 import asyncio
+from datetime import datetime
 from enum import StrEnum
 from typing import Any, Dict, List, Optional
 from concurrent.futures import ProcessPoolExecutor
 
 import psutil
 from pydantic import BaseModel
+import store
 from logger import ScraperLog
 from main import main
+from profiling import profile_filepath
+from settings import settings
+from slots import acquire_browser_slot
 
-from fastapi import FastAPI, HTTPException, Security
+from fastapi import FastAPI, Header, HTTPException, Security
 from fastapi.security.api_key import APIKeyHeader
 from fastapi.responses import RedirectResponse
 
@@ -22,17 +28,29 @@ from fastapi.responses import RedirectResponse
 #     executor.shutdown(wait=True)
 
 
-def kill_bridge_js_processes() -> None:
-    """Find and terminate Node.js processes running bridge.js specifically."""
-    for proc in psutil.process_iter(attrs=["pid", "name", "cmdline"]):
+def kill_bridge_js_processes(parent_pids: List[int]) -> None:
+    """
+    Find and terminate Node.js processes running bridge.js specifically.
+
+    Only descendants of `parent_pids` are considered, so browsers of other
+    requests and other API workers are left alone.
+    """
+    children: List[psutil.Process] = []
+    for pid in parent_pids:
+        try:
+            children.extend(psutil.Process(pid).children(recursive=True))
+        except psutil.NoSuchProcess:
+            continue
+
+    for proc in children:
         try:
-            cmdline = proc.info["cmdline"]
+            cmdline = proc.cmdline()
             if cmdline and any("bridge.js" in arg for arg in cmdline):
                 proc.terminate()  # Graceful shutdown
                 proc.wait(timeout=5)  # Wait up to 5 seconds before force-killing
                 if proc.is_running():  # If still running, force kill
                     proc.kill()
-                print(f"Killed bridge.js process (PID: {proc.info['pid']})")
+                print(f"Killed bridge.js process (PID: {proc.pid})")
         except (psutil.NoSuchProcess, psutil.AccessDenied):
             continue  # Process already gone or no permission to access
 
@@ -44,11 +62,14 @@ API_KEY_NAME = "X-API-Key"
 
 
 async def run_scraper_async(
-    terms: list[str], script: str, executor: ProcessPoolExecutor
+    terms: list[str],
+    script: str,
+    executor: ProcessPoolExecutor,
+    profile_name: Optional[str] = None,
 ) -> Optional[List[Dict[str, Any]]]:
     """Run the scraper asynchronously using ProcessPoolExecutor."""
     loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(executor, main, terms, script)
+    return await loop.run_in_executor(executor, main, terms, script, profile_name)
 
 
 class Script(StrEnum):
@@ -74,30 +95,75 @@ def get_api_key(api_key: str = Security(api_key_header)) -> str:
 @app.post("/scrape/")
 async def scrape(
     request: ScrapeRequest,
+    x_profile: bool = Header(default=False),
+    x_request_id: Optional[str] = Header(default=None),
     # api_key: str = Depends(get_api_key),
 ) -> Dict[str, Any]:
-    """Non-blocking scraper endpoint."""
+    """
+    Non-blocking scraper endpoint.
+
+    Send `X-Profile: true` to profile the scrape; the speedscope file is named
+    after `X-Request-ID` (or a random id) and its path returned as `profile`.
+    Responds 429 when every host-wide browser slot is in use.
+    """
+    slot = acquire_browser_slot()
+    if slot is None:
+        raise HTTPException(
+            status_code=429,
+            detail="All browser slots are busy",
+            headers={"Retry-After": str(settings.slot_retry_after)},
+        )
+
     start_time = time.time()
-    executor = ProcessPoolExecutor(max_workers=1)
+    executor: Optional[ProcessPoolExecutor] = None
+    profile_name = None
+    if x_profile:
+        profile_name = f"{request.script}_{x_request_id or uuid.uuid4().hex}"
 
     try:
+        executor = ProcessPoolExecutor(max_workers=1)
         result = await run_scraper_async(
-            [request.search_term], request.script, executor
+            [request.search_term], request.script, executor, profile_name
         )
         end_time = time.time()
         elapsed_time = round(end_time - start_time, 2)
 
-        return {
+        response: Dict[str, Any] = {
             "elapsed_time": elapsed_time,
             "result": result,
         }
+        if profile_name is not None:
+            response["profile"] = str(profile_filepath(profile_name))
+        return response
     except Exception as e:
         raise e
     finally:
-        ScraperLog.debug("Shutting down executor")
-        kill_bridge_js_processes()
-        executor.shutdown(wait=True)
-        ScraperLog.debug("Executor shut down")
+        try:
+            if executor is not None:
+                ScraperLog.debug("Shutting down executor")
+                kill_bridge_js_processes(list(executor._processes or {}))
+                executor.shutdown(wait=True)
+                ScraperLog.debug("Executor shut down")
+        finally:
+            slot.release()
+
+
+@app.get("/vessels/{name}/latest")
+def vessel_latest(name: str, script: Optional[Script] = None) -> Dict[str, Any]:
+    """Latest stored voyage record for a vessel name or IMO, without scraping."""
+    record = store.get_latest(name, script)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Vessel not found in store")
+    return record
+
+
+@app.get("/vessels/{name}/history")
+def vessel_history(
+    name: str, script: Optional[Script] = None, since: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """Stored voyage records for a vessel name or IMO, newest first."""
+    records = store.get_history(name, script, since)
+    return {"count": len(records), "result": records}
 
 
 @app.get("/", include_in_schema=False)
@@ -0,0 +1,7 @@
+from settings import settings
+
+bind = "0.0.0.0:8000"
+workers = settings.workers
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = 300  # A scrape can take minutes when a captcha has to be solved
+graceful_timeout = 60
@@ -1,8 +1,10 @@
 import argparse
+from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from logger import ScraperLog
 from marinetraffic import scrape_marinetraffic
+from profiling import profile
 
 # from utils import timetracker
 from vesselfinder import scrape_vesselfinder
@@ -26,14 +28,17 @@ def run_marinetraffic(terms: List[str]) -> List[Dict[str, Any]]:
 
 
 # @timetracker
-def main(terms: List[str], script: str) -> Optional[List[Dict[str, Any]]]:
-    if script == "vesselfinder":
-        result = run_vesselfinder(terms)
-        return result
-
-    if script == "marinetraffic":
-        result = run_marinetraffic(terms)
-        return result
+def main(
+    terms: List[str], script: str, profile_name: Optional[str] = None
+) -> Optional[List[Dict[str, Any]]]:
+    with profile(profile_name):
+        if script == "vesselfinder":
+            result = run_vesselfinder(terms)
+            return result
+
+        if script == "marinetraffic":
+            result = run_marinetraffic(terms)
+            return result
 
     return None
 
@@ -53,9 +58,17 @@ if __name__ == "__main__":
         required=True,
         help="List of search terms to use.",
     )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Save a speedscope profile of the run to the profiles directory.",
+    )
 
     args = parser.parse_args()
-    result = main(args.terms, args.name)
+    profile_name = None
+    if args.profile:
+        profile_name = f"{args.name}_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}"
+    result = main(args.terms, args.name, profile_name)
     assert result is not None
     ScraperLog.info(f"Total Results: {len(result)}")
     ScraperLog.debug(f"Results: {result}")
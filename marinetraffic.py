@@ -10,6 +10,9 @@ from botasaurus.browser import browser, Driver
 from botasaurus.soupify import soupify
 from botasaurus.user_agent import UserAgent
 
+import network
+import ports
+import store
 from logger import ScraperLog
 from settings import settings
 
@@ -37,7 +40,8 @@ def convert_time_format(datetime_str: str) -> str:
     timezone_offset = int(tz_part.rstrip(")"))
     dt = datetime.strptime(dt_part, "%Y-%m-%d %H:%M")
     tz = pytz.FixedOffset(timezone_offset * 60)
-    return dt.replace(tzinfo=tz).strftime("%Y-%m-%d %H:%M")
+    # Port-local time with its offset, e.g. `2025-01-29 22:00+05:00`
+    return dt.replace(tzinfo=tz).isoformat(sep=" ", timespec="minutes")
 
 
 @browser(
@@ -52,12 +56,15 @@ def convert_time_format(datetime_str: str) -> str:
     user_agent=UserAgent.RANDOM,
     block_images_and_css=True,
 )  # type: ignore
-def scrape_html(driver: Driver, data: Dict[str, Any]) -> Tuple[str, str]:
+def scrape_html(
+    driver: Driver, data: Dict[str, Any]
+) -> Tuple[str, str, Dict[str, int]]:
     detail_page_url = ""
     link = data["link"]
     search_text = data["search_text"]
     wait_time = 10
     sleep_time = 2
+    stats = network.track(driver, settings.marinetraffic_blocked_urls)
 
     referer = (
         "https://www.marinetraffic.com/en/ais/home/centerx:-12.0/centery:25.0/zoom:4"
@@ -125,7 +132,7 @@ def scrape_html(driver: Driver, data: Dict[str, Any]) -> Tuple[str, str]:
                 for result in results
             ]
             ScraperLog.debug(f"Other Options: {results}")
-            return "", detail_page_url
+            return "", detail_page_url, network.report(stats, search_text)
 
     time.sleep(sleep_time)
 
@@ -142,7 +149,7 @@ def scrape_html(driver: Driver, data: Dict[str, Any]) -> Tuple[str, str]:
         "#vesselDetails_voyageSection > div > div.css-qxl29p > div", wait=wait_time
     )
     html: str = driver.page_html
-    return html, detail_page_url
+    return html, detail_page_url, network.report(stats, search_text)
 
 
 def extract_data(soup: BeautifulSoup) -> Dict[str, Any]:
@@ -211,6 +218,7 @@ def write_to_file(data: List[Dict[str, Any]], result: List[Dict[str, Any]]) -> N
     settings.output_dir.mkdir(parents=True, exist_ok=True)
 
     bt.write_json(result, settings.output_dir / "marinetraffic.json")
+    store.save_results("marinetraffic", result)
 
 
 @task(
@@ -224,10 +232,14 @@ def write_to_file(data: List[Dict[str, Any]], result: List[Dict[str, Any]]) -> N
 def scrape_data(data: Dict[str, Any]) -> Dict[str, Any]:
     search_text = data["search_text"]
     ScraperLog.info(f"Scraping marinetraffic for {search_text}")
-    html, detail_page_url = scrape_html(data)
+    html, detail_page_url, network_stats = scrape_html(data)
     if html == "":
-        return {}
-    return {**extract_data(soupify(html)), "url": detail_page_url}
+        return {"network": network_stats}
+    return {
+        **ports.enrich(extract_data(soupify(html))),
+        "url": detail_page_url,
+        "network": network_stats,
+    }
 
 
 def scrape_marinetraffic(data: List[Dict[str, str]]) -> List[Dict[str, Any]]:
@@ -0,0 +1,87 @@
+from typing import Any, Dict, List, Optional
+
+from botasaurus.browser import Driver
+from botasaurus_driver import cdp
+
+from logger import ScraperLog
+
+
+# `block_images_and_css=True` patterns, repeated since setting blocked URLs
+# replaces the whole list.
+IMAGE_AND_CSS_URLS = [
+    ".css",
+    ".jpg",
+    ".jpeg",
+    ".png",
+    ".svg",
+    ".gif",
+    ".webp",
+    ".woff",
+    ".pdf",
+    ".zip",
+    ".ico",
+]
+
+
+class NetworkStats:
+    """Requests and bytes transferred by a browser for one scrape."""
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.requests = 0
+        self.blocked = 0
+        self.failed = 0
+        self.bytes = 0
+
+    def on_request(self, event: cdp.network.RequestWillBeSent) -> None:
+        self.requests += 1
+
+    def on_finished(self, event: cdp.network.LoadingFinished) -> None:
+        self.bytes += int(event.encoded_data_length)
+
+    def on_failed(self, event: cdp.network.LoadingFailed) -> None:
+        if event.blocked_reason is not None:
+            self.blocked += 1
+        else:
+            self.failed += 1
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "requests": self.requests,
+            "blocked": self.blocked,
+            "failed": self.failed,
+            "bytes": self.bytes,
+        }
+
+
+def install(driver: Driver, blocked_urls: List[str]) -> NetworkStats:
+    """Block `blocked_urls` and start counting traffic on a driver."""
+    stats = NetworkStats()
+    setattr(driver, "network_stats", stats)  # Lives and dies with the driver
+
+    tab: Any = driver._tab
+    tab.add_handler(cdp.network.RequestWillBeSent, stats.on_request)
+    tab.add_handler(cdp.network.LoadingFinished, stats.on_finished)
+    tab.add_handler(cdp.network.LoadingFailed, stats.on_failed)
+    driver.run_cdp_command(cdp.network.enable())
+    driver.block_urls([*IMAGE_AND_CSS_URLS, *blocked_urls])
+    return stats
+
+
+def track(driver: Driver, blocked_urls: List[str]) -> NetworkStats:
+    """Counters for the next vessel, installing the blocklist on new drivers."""
+    stats: Optional[NetworkStats] = getattr(driver, "network_stats", None)
+    if driver.config.is_new or stats is None:
+        stats = install(driver, blocked_urls)
+    stats.reset()
+    return stats
+
+
+def report(stats: NetworkStats, search_text: str) -> Dict[str, int]:
+    ScraperLog.info(
+        f"{search_text}: {stats.requests} requests ({stats.blocked} blocked,"
+        f" {stats.failed} failed), {round(stats.bytes / 1024, 1)} KB transferred"
+    )
+    return stats.as_dict()
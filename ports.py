@@ -0,0 +1,193 @@
+import re
+import csv
+import unicodedata
+from pathlib import Path
+from functools import lru_cache
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from logger import ScraperLog
+from settings import settings
+
+
+FUZZY_THRESHOLD = 0.6  # with a matching country hint or distinctive word
+STRICT_FUZZY_THRESHOLD = 0.9  # otherwise
+# Words shared by many unrelated ports, e.g. Tanjung Priok and Tanjung Pelepas
+GENERIC_WORDS = {
+    "AL",
+    "BAY",
+    "CITY",
+    "DE",
+    "EAST",
+    "EL",
+    "HARBOR",
+    "HARBOUR",
+    "KHOR",
+    "LA",
+    "LE",
+    "NEW",
+    "NORTH",
+    "OF",
+    "PORT",
+    "PORTO",
+    "PUERTO",
+    "SAINT",
+    "SAN",
+    "SANTA",
+    "SOUTH",
+    "ST",
+    "TANJUNG",
+    "THE",
+    "WEST",
+}
+PARENTHESIS_PATTERN = re.compile(r"\(([^)]*)\)")
+
+
+def normalize_port_name(name: str) -> str:
+    """Uppercase ASCII words only, e.g. `Génova (ex Genoa)` -> `GENOVA EX GENOA`."""
+    ascii_name = (
+        unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+    )
+    return " ".join(re.sub(r"[^A-Za-z0-9]+", " ", ascii_name).upper().split())
+
+
+def name_variants(name: str) -> Set[str]:
+    """A UN/LOCODE name and its bracketed alternative, e.g. `Chennai (ex Madras)`."""
+    variants = {normalize_port_name(name)}
+    variants.add(normalize_port_name(PARENTHESIS_PATTERN.sub(" ", name)))
+    for alternative in PARENTHESIS_PATTERN.findall(name):
+        variants.add(normalize_port_name(re.sub(r"^\s*ex\s+", "", alternative)))
+    variants.discard("")
+    return variants
+
+
+def trigrams(name: str) -> Set[str]:
+    padded = f"  {name} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class PortIndex:
+    """In-memory UN/LOCODE port index with exact and trigram lookups."""
+
+    def __init__(self) -> None:
+        self.codes: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+        self.countries: Dict[str, str] = {}
+        self.names: List[str] = []
+        self.gram_counts: List[int] = []
+        self.grams: Dict[str, List[int]] = defaultdict(list)
+
+    def add(self, country: str, code: str, name: str) -> None:
+        for variant in name_variants(name):
+            if variant not in self.codes:
+                variant_grams = trigrams(variant)
+                self.names.append(variant)
+                self.gram_counts.append(len(variant_grams))
+                for gram in variant_grams:
+                    self.grams[gram].append(len(self.names) - 1)
+            self.codes[variant].append((country, f"{country}{code}"))
+
+    @classmethod
+    def load(cls, filepath: Path) -> "PortIndex":
+        """Build the index from a UN/LOCODE CodeList CSV, keeping ports only."""
+        index = cls()
+        with filepath.open(newline="", encoding="latin-1") as file:
+            for row in csv.reader(file):
+                if len(row) < 7:
+                    continue
+                _, country, code, name, name_ascii, _, function = row[:7]
+                if not code:
+                    if name.startswith("."):
+                        country_name = normalize_port_name(name[1:])
+                        index.countries[country_name] = country
+                    continue
+                if function.startswith("1"):
+                    index.add(country, code, name_ascii or name)
+
+        ScraperLog.debug(f"Loaded {len(index.names)} port names from {filepath.name}")
+        return index
+
+    def split_country(self, query: str) -> Tuple[str, Optional[str]]:
+        """Split `NHAVA SHEVA, IN` or `Nhava Sheva, India` into name and country."""
+        name, _, country = query.rpartition(",")
+        if not name:
+            return query, None
+
+        country = normalize_port_name(country)
+        if len(country) == 2:
+            return name, country
+        if country in self.countries:
+            return name, self.countries[country]
+        return query, None
+
+    def pick(
+        self, candidates: List[Tuple[str, str]], country: Optional[str]
+    ) -> Optional[str]:
+        if country is not None:
+            candidates = [c for c in candidates if c[0] == country]
+        codes = {code for _, code in candidates}
+        return codes.pop() if len(codes) == 1 else None
+
+    def fuzzy(self, name: str, country: Optional[str]) -> Optional[str]:
+        """
+        Closest similar name, accepted only when its country matches the hint
+        or it shares a distinctive word with `name`, unless nearly identical.
+        """
+        query_grams = trigrams(name)
+        query_words = set(name.split()) - GENERIC_WORDS
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in query_grams:
+            for name_id in self.grams.get(gram, ()):
+                shared[name_id] += 1
+
+        ranked = []
+        for name_id, count in shared.items():
+            score = 2 * count / (len(query_grams) + self.gram_counts[name_id])
+            if score >= FUZZY_THRESHOLD:
+                ranked.append((score, self.names[name_id]))
+
+        for score, candidate in sorted(ranked, reverse=True):
+            code = self.pick(self.codes[candidate], country)
+            if code is None:
+                continue
+            distinctive = bool(query_words & set(candidate.split()))
+            if country is not None or distinctive or score >= STRICT_FUZZY_THRESHOLD:
+                return code
+        return None
+
+    def lookup(self, query: str) -> Optional[str]:
+        name, country = self.split_country(query)
+        name = normalize_port_name(name)
+        if not name:
+            return None
+
+        if name in self.codes:
+            code = self.pick(self.codes[name], country)
+            if code is not None:
+                return code
+
+        return self.fuzzy(name, country)
+
+
+_index: Optional[PortIndex] = None
+
+
+def get_index() -> PortIndex:
+    global _index
+    if _index is None:
+        _index = PortIndex.load(settings.port_index_filepath)
+    return _index
+
+
+@lru_cache(maxsize=4096)
+def lookup_port_code(name: str) -> Optional[str]:
+    """UN/LOCODE of a scraped port name, e.g. `Nhava Sheva, IN` -> `INNSA`."""
+    return get_index().lookup(name)
+
+
+def enrich(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill missing `last_port_code`/`next_port_code` from the local port index."""
+    for prefix in ("last_port", "next_port"):
+        name = record.get(f"{prefix}_name")
+        if name and not record.get(f"{prefix}_code"):
+            record[f"{prefix}_code"] = lookup_port_code(name)
+    return record
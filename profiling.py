@@ -0,0 +1,127 @@
+import re
+import sys
+import json
+import time
+import threading
+from pathlib import Path
+from types import FrameType
+from contextlib import contextmanager
+from collections import defaultdict
+from typing import Any, DefaultDict, Dict, Iterator, List, Optional, Tuple
+
+from logger import ScraperLog
+from settings import settings
+
+
+FrameKey = Tuple[str, str, int]
+
+
+class SamplingProfiler:
+    """
+    Samples the stacks of every thread in the process at a fixed interval.
+
+    Sampling from a background thread keeps the overhead on the profiled
+    code low and also covers the worker threads botasaurus scrapes in.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self.frames: Dict[FrameKey, int] = {}
+        self.samples: DefaultDict[int, List[List[int]]] = defaultdict(list)
+        self.weights: DefaultDict[int, List[float]] = defaultdict(list)
+        self.thread_names: Dict[int, str] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+
+    def start(self) -> None:
+        self.started_at = time.perf_counter()
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self.started_at
+
+    def _frame_index(self, frame: FrameType) -> int:
+        code = frame.f_code
+        key = (code.co_name, code.co_filename, code.co_firstlineno)
+        return self.frames.setdefault(key, len(self.frames))
+
+    def _sample(self, weight: float) -> None:
+        for thread in threading.enumerate():
+            if thread.ident is not None:
+                self.thread_names.setdefault(thread.ident, thread.name)
+
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == self._thread.ident:
+                continue
+
+            stack: List[int] = []
+            current: Optional[FrameType] = frame
+            while current is not None:
+                stack.append(self._frame_index(current))
+                current = current.f_back
+            stack.reverse()
+
+            self.samples[thread_id].append(stack)
+            self.weights[thread_id].append(weight)
+
+    def _run(self) -> None:
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            self._sample(now - last)
+            last = now
+
+    def speedscope(self, name: str) -> Dict[str, Any]:
+        """Profile in the speedscope file format, one profile per thread."""
+        frames = [
+            {"name": func, "file": filename, "line": line}
+            for (func, filename, line), _ in sorted(
+                self.frames.items(), key=lambda item: item[1]
+            )
+        ]
+        profiles = [
+            {
+                "type": "sampled",
+                "name": self.thread_names.get(thread_id, str(thread_id)),
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": self.duration,
+                "samples": samples,
+                "weights": self.weights[thread_id],
+            }
+            for thread_id, samples in self.samples.items()
+        ]
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "vessels_traffic_scraper",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": profiles,
+        }
+
+
+def profile_filepath(name: str) -> Path:
+    safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "_", name)
+    return settings.profiles_directory / f"{safe_name}.speedscope.json"
+
+
+@contextmanager
+def profile(name: Optional[str]) -> Iterator[Optional[Path]]:
+    """Profile the enclosed block into a speedscope file when `name` is given."""
+    if name is None:
+        yield None
+        return
+
+    filepath = profile_filepath(name)
+    profiler = SamplingProfiler(settings.profile_interval)
+    profiler.start()
+    try:
+        yield filepath
+    finally:
+        profiler.stop()
+        settings.profiles_directory.mkdir(parents=True, exist_ok=True)
+        filepath.write_text(json.dumps(profiler.speedscope(name)))
+        ScraperLog.info(f"Saved profile to {filepath}")
@@ -0,0 +1,227 @@
+import json
+import argparse
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+import ports
+from logger import ScraperLog
+from settings import settings
+
+
+SCHEDULE_TIMEZONE = "Asia/Kolkata"
+SCHEDULE_PORT_CODE = "INNSA"  # Nhava Sheva, port of the NSIGT/NSFT/BMCT/GTI terminals
+
+ARRIVED_STATUSES = ["Arrived", "Actual"]
+
+
+def normalize_names(names: pd.Series) -> pd.Series:
+    return names.fillna("").astype(str).str.upper().str.split().str.join(" ")
+
+
+def parse_schedule_times(values: pd.Series) -> pd.Series:
+    """
+    Parse both schedule timestamp formats into UTC.
+
+    ETA looks like `Wed Jan 29 22:00:00 IST 2025`, ETD like `2025-01-30 00:00:00.0`.
+    """
+    values = values.where(values != "null")
+    cleaned = values.str.replace(" IST ", " ", regex=False)
+    parsed = pd.to_datetime(cleaned, format="%a %b %d %H:%M:%S %Y", errors="coerce")
+    parsed = parsed.fillna(
+        pd.to_datetime(values, format="%Y-%m-%d %H:%M:%S.%f", errors="coerce")
+    )
+    return parsed.dt.tz_localize(SCHEDULE_TIMEZONE).dt.tz_convert("UTC")
+
+
+def parse_scraped_times(values: pd.Series) -> pd.Series:
+    """Vectorized `utils.parse_scraped_time`."""
+    return pd.to_datetime(
+        values.where(values != ""), format="ISO8601", utc=True, errors="coerce"
+    )
+
+
+def port_codes(names: pd.Series, codes: pd.Series) -> pd.Series:
+    """Scraped port codes, filled from the local port index where missing."""
+    lookup = {name: ports.lookup_port_code(name) for name in names.dropna().unique()}
+    codes = codes.astype("string").str.replace(" ", "").str.upper()
+    return codes.fillna(names.map(lookup).astype("string"))
+
+
+def load_schedule(filepath: Path) -> pd.DataFrame:
+    schedule = pd.read_csv(filepath, dtype=str, keep_default_na=False)
+    schedule["vessel_key"] = normalize_names(schedule["Vessel Name"])
+    schedule["eta"] = parse_schedule_times(schedule["ETA"])
+    schedule["etd"] = parse_schedule_times(schedule["ETD"])
+    return schedule
+
+
+def load_scraped(filepath: Path) -> pd.DataFrame:
+    with filepath.open(encoding="utf-8") as file:
+        records = [record for record in json.load(file) if record.get("url")]
+
+    scraped = pd.DataFrame.from_records(records).reindex(
+        columns=[
+            "search_text",
+            "next_port_name",
+            "next_port_code",
+            "next_port_date",
+            "next_port_date_status",
+            "last_port_name",
+            "last_port_code",
+            "last_port_etd",
+        ]
+    )
+    scraped["vessel_key"] = normalize_names(scraped["search_text"])
+    scraped["next_port_locode"] = port_codes(
+        scraped["next_port_name"], scraped["next_port_code"]
+    )
+    scraped["last_port_locode"] = port_codes(
+        scraped["last_port_name"], scraped["last_port_code"]
+    )
+    scraped["scraped_eta"] = parse_scraped_times(scraped["next_port_date"])
+    scraped["scraped_etd"] = parse_scraped_times(scraped["last_port_etd"])
+    return scraped.drop_duplicates("vessel_key", keep="last")
+
+
+def reconcile(
+    schedule: pd.DataFrame,
+    scraped: pd.DataFrame,
+    tolerance_hours: float,
+    port_code: str = SCHEDULE_PORT_CODE,
+    as_of: Optional[pd.Timestamp] = None,
+) -> pd.DataFrame:
+    """
+    Join the schedule with scraped data and flag every discrepancy.
+
+    The scraped ETA and status describe the schedule's call only while the
+    vessel is heading to `port_code`, and the scraped ETD only once it left
+    that port; other rows get no delta and are not flagged.
+    """
+    as_of = as_of if as_of is not None else pd.Timestamp.now(tz="UTC")
+    report = schedule.merge(scraped, on="vessel_key", how="left", indicator=True)
+    inbound = (report["next_port_locode"] == port_code).fillna(False)
+    departed = (report["last_port_locode"] == port_code).fillna(False)
+
+    report["eta_delta_hours"] = (
+        report["scraped_eta"] - report["eta"]
+    ).dt.total_seconds().where(inbound) / 3600
+    report["etd_delta_hours"] = (
+        report["scraped_etd"] - report["etd"]
+    ).dt.total_seconds().where(departed) / 3600
+
+    # The schedule's Status is only ever Estimated, On Time, Postponed or
+    # Preponed, so arrival is inferred from a passed ETA that was not postponed.
+    scraped_arrived = report["next_port_date_status"].isin(ARRIVED_STATUSES)
+    report["expected_arrived"] = (report["eta"] <= as_of) & ~report[
+        "Status"
+    ].str.startswith("Postponed")
+    report["status_mismatch"] = (
+        inbound
+        & report["eta"].notna()
+        & (scraped_arrived != report["expected_arrived"])
+    )
+
+    report["missing_scrape"] = report["_merge"] == "left_only"
+    report["eta_mismatch"] = report["eta_delta_hours"].abs() > tolerance_hours
+    report["etd_mismatch"] = report["etd_delta_hours"].abs() > tolerance_hours
+
+    flags = ["missing_scrape", "eta_mismatch", "etd_mismatch", "status_mismatch"]
+    report = report[report[flags].any(axis=1)]
+
+    return report[
+        [
+            "Vessel Name",
+            "Service Name",
+            "Terminal",
+            "Status",
+            "expected_arrived",
+            "next_port_date_status",
+            "next_port_name",
+            "last_port_name",
+            "eta",
+            "scraped_eta",
+            "eta_delta_hours",
+            "etd",
+            "scraped_etd",
+            "etd_delta_hours",
+            *flags,
+        ]
+    ]
+
+
+def run_reconciliation(
+    provider: str,
+    schedule_filepath: Path,
+    scraped_filepath: Optional[Path] = None,
+    report_filepath: Optional[Path] = None,
+    tolerance_hours: float = 6,
+    port_code: str = SCHEDULE_PORT_CODE,
+) -> Path:
+    scraped_filepath = scraped_filepath or settings.output_dir / f"{provider}.json"
+    report_filepath = (
+        report_filepath or settings.output_dir / f"{provider}_discrepancies.csv"
+    )
+
+    schedule = load_schedule(schedule_filepath)
+    scraped = load_scraped(scraped_filepath)
+    report = reconcile(schedule, scraped, tolerance_hours, port_code)
+
+    report_filepath.parent.mkdir(parents=True, exist_ok=True)
+    report.to_csv(report_filepath, index=False)
+    ScraperLog.info(
+        f"{len(report)} of {len(schedule)} scheduled vessels differ from"
+        f" {provider}. Report saved to {report_filepath}"
+    )
+    return report_filepath
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Reconcile the terminal schedule with scraped vessel data."
+    )
+
+    parser.add_argument(
+        "--name",
+        choices=["vesselfinder", "marinetraffic"],
+        required=True,
+        help="Specify which scraper output to reconcile against.",
+    )
+    parser.add_argument(
+        "--schedule",
+        type=Path,
+        default=settings.search_terms_filepath,
+        help="Schedule CSV (Vessel Name, Service Name, Terminal, ETA, ETD, Status).",
+    )
+    parser.add_argument(
+        "--scraped",
+        type=Path,
+        help="Scraper output JSON. Defaults to the provider file in OUTPUT_DIR.",
+    )
+    parser.add_argument(
+        "--report",
+        type=Path,
+        help="Discrepancy report CSV. Defaults to OUTPUT_DIR.",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=6,
+        help="Allowed ETA/ETD difference in hours.",
+    )
+    parser.add_argument(
+        "--port",
+        default=SCHEDULE_PORT_CODE,
+        help="UN/LOCODE of the schedule's port.",
+    )
+
+    args = parser.parse_args()
+    run_reconciliation(
+        args.name,
+        args.schedule,
+        args.scraped,
+        args.report,
+        args.tolerance,
+        args.port,
+    )
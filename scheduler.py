@@ -0,0 +1,168 @@
+import time
+import argparse
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import store
+from logger import ScraperLog
+from main import main
+from settings import settings
+from utils import get_search_terms, parse_scraped_time
+
+
+# (hours until ETA, refresh interval) - the closer to arrival, the more often
+ETA_TIERS: List[Tuple[timedelta, timedelta]] = [
+    (timedelta(hours=6), timedelta(minutes=30)),
+    (timedelta(hours=24), timedelta(hours=1)),
+    (timedelta(hours=72), timedelta(hours=4)),
+]
+OVERDUE_INTERVAL = timedelta(minutes=30)  # ETA passed but not arrived yet
+JUST_DEPARTED_WINDOW = timedelta(hours=12)
+JUST_DEPARTED_INTERVAL = timedelta(hours=3)
+MID_OCEAN_INTERVAL = timedelta(hours=12)
+ARRIVED_INTERVAL = timedelta(hours=12)
+UNKNOWN_INTERVAL = timedelta(hours=6)
+NOT_FOUND_INTERVAL = timedelta(hours=24)
+
+
+def refresh_interval(record: Dict[str, Any], now: datetime) -> timedelta:
+    """How long a scraped voyage record stays fresh."""
+    status = record.get("next_port_date_status")
+    eta = parse_scraped_time(record.get("next_port_date"))
+    etd = parse_scraped_time(record.get("last_port_etd"))
+
+    if status in ("Arrived", "Actual"):
+        return ARRIVED_INTERVAL
+
+    if eta is None:
+        return UNKNOWN_INTERVAL
+
+    time_to_eta = eta - now
+    if time_to_eta <= timedelta(0):
+        return OVERDUE_INTERVAL
+
+    for within, interval in ETA_TIERS:
+        if time_to_eta <= within:
+            return interval
+
+    if etd is not None and timedelta(0) <= now - etd <= JUST_DEPARTED_WINDOW:
+        return JUST_DEPARTED_INTERVAL
+
+    return MID_OCEAN_INTERVAL
+
+
+def next_refresh_at(
+    record: Optional[Dict[str, Any]], last_attempt: Optional[datetime], now: datetime
+) -> datetime:
+    """When a vessel should be scraped next; never-seen vessels are due at once."""
+    if record is None:
+        if last_attempt is None:
+            return datetime.min.replace(tzinfo=timezone.utc)
+        return last_attempt + NOT_FOUND_INTERVAL
+
+    scraped_at = datetime.fromisoformat(record["last_scraped_at"])
+    if last_attempt is not None:
+        scraped_at = max(scraped_at, last_attempt)
+    return scraped_at + refresh_interval(record, now)
+
+
+class RefreshScheduler:
+    """Scrapes the vessels of one provider in due order within an hourly budget."""
+
+    def __init__(self, script: str, terms: List[str], requests_per_hour: int):
+        self.script = script
+        self.terms = {store.normalize_name(term): term for term in terms}
+        self.requests_per_hour = requests_per_hour
+
+    def remaining_budget(self, now: datetime) -> int:
+        """Attempts left this hour, counted in the store so `--once` runs share it."""
+        sent = store.count_attempts(self.script, now - timedelta(hours=1))
+        return max(self.requests_per_hour - sent, 0)
+
+    def due_terms(self, now: datetime) -> List[str]:
+        """Search terms that are due for a refresh, most overdue first."""
+        latest = store.get_latest_by_vessel(self.script)
+        last_attempts = store.get_last_attempts(self.script)
+        due: List[Tuple[datetime, str]] = []
+
+        for name, term in self.terms.items():
+            refresh_at = next_refresh_at(latest.get(name), last_attempts.get(name), now)
+            if refresh_at <= now:
+                due.append((refresh_at, term))
+
+        due.sort()
+        return [term for _, term in due]
+
+    def run_once(self, batch_size: int) -> int:
+        """Scrape one batch of due vessels. Returns the number scraped."""
+        now = datetime.now(timezone.utc)
+        due = self.due_terms(now)
+        budget = self.remaining_budget(now)
+        batch = due[: min(batch_size, budget)]
+
+        ScraperLog.info(
+            f"{len(due)} {self.script} vessels due, scraping {len(batch)}"
+            f" (budget left: {budget})"
+        )
+        if not batch:
+            return 0
+
+        store.record_attempts(self.script, batch, now)
+
+        try:
+            main(batch, self.script)
+        except Exception as e:
+            ScraperLog.error(f"Scheduled {self.script} scrape failed: {e}")
+
+        return len(batch)
+
+    def run_forever(self, batch_size: int, interval: int) -> None:
+        while True:
+            self.run_once(batch_size)
+            time.sleep(interval)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Refresh vessels in ETA-aware priority order."
+    )
+
+    parser.add_argument(
+        "--name",
+        choices=["vesselfinder", "marinetraffic"],
+        required=True,
+        help="Specify which script to run (vesselfinder or marinetraffic).",
+    )
+    parser.add_argument(
+        "--terms",
+        nargs="+",
+        help="List of search terms to use. Defaults to the search terms file.",
+    )
+    parser.add_argument(
+        "--batch",
+        type=int,
+        default=settings.parallel,
+        help="Maximum vessels scraped per tick.",
+    )
+    parser.add_argument(
+        "--interval",
+        type=int,
+        default=60,
+        help="Seconds between scheduler ticks.",
+    )
+    parser.add_argument(
+        "--once",
+        action="store_true",
+        help="Run a single tick and exit.",
+    )
+
+    args = parser.parse_args()
+    terms = args.terms or get_search_terms(settings.search_terms_filepath)
+    scheduler = RefreshScheduler(
+        args.name, terms, settings.scheduler_requests_per_hour
+    )
+
+    if args.once:
+        scheduler.run_once(args.batch)
+    else:
+        scheduler.run_forever(args.batch, args.interval)
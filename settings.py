@@ -5,6 +5,25 @@ from pydantic_settings import BaseSettings
 
 BASE_DIR = Path(__file__).resolve().parent
 
+# Third-party requests neither provider needs: ads, analytics, consent
+# management and map tiles.
+THIRD_PARTY_URLS = [
+    "*doubleclick.net*",
+    "*googlesyndication.com*",
+    "*googletagservices.com*",
+    "*googletagmanager.com*",
+    "*google-analytics.com*",
+    "*adservice.google.*",
+    "*amazon-adsystem.com*",
+    "*facebook.net*",
+    "*hotjar.com*",
+    "*quantcast.com*",
+    "*quantserve.com*",
+    "*api.mapbox.com*",
+    "*.pbf*",
+    "*.mvt*",
+]
+
 
 class Settings(BaseSettings):
     captcha_solver_api_key: str = Field(default="", description="2captcha API key")
@@ -21,6 +40,40 @@ class Settings(BaseSettings):
     logs_directory: Path = Field(default=BASE_DIR / "logs")
     debug: bool = Field(default=False)
     reuse_browser: bool = Field(default=False, description="Reuse driver")
+    marinetraffic_blocked_urls: List[str] = Field(
+        default=[*THIRD_PARTY_URLS, "*nr-data.net*"],
+        description="URL patterns blocked in marinetraffic browsers",
+    )
+    vesselfinder_blocked_urls: List[str] = Field(
+        default=THIRD_PARTY_URLS,
+        description="URL patterns blocked in vesselfinder browsers",
+    )
+    workers: int = Field(default=2, description="Gunicorn API worker processes")
+    browser_slots: int = Field(
+        default=4, description="Browsers allowed at once across all API workers"
+    )
+    slots_directory: Path = Field(default=BASE_DIR / "slots")
+    slot_retry_after: int = Field(
+        default=30, description="Retry-After seconds when no browser slot is free"
+    )
+    vesselfinder_accept_consent: bool = Field(
+        default=False,
+        description="Click the consent dialog, needed when Quantcast is not blocked",
+    )
+    store_filepath: Path = Field(
+        default=BASE_DIR / "voyages.db", description="SQLite voyage history store"
+    )
+    port_index_filepath: Path = Field(
+        default=BASE_DIR / "data" / "unlocode_ports.csv",
+        description="UN/LOCODE CodeList CSV used to fill missing port codes",
+    )
+    profiles_directory: Path = Field(default=BASE_DIR / "profiles")
+    profile_interval: float = Field(
+        default=0.005, description="Seconds between profiler samples"
+    )
+    scheduler_requests_per_hour: int = Field(
+        default=60, description="Scrape budget of the refresh scheduler per hour"
+    )
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,28 @@
+import random
+from typing import Optional
+
+import filelock
+
+from settings import settings
+
+
+def acquire_browser_slot() -> Optional[filelock.FileLock]:
+    """
+    Take one of the host-wide browser slots without waiting.
+
+    Each slot is a lock file shared by every API worker; the OS releases it
+    if the holding worker dies. Returns None when all slots are taken.
+    """
+    settings.slots_directory.mkdir(parents=True, exist_ok=True)
+
+    offset = random.randrange(settings.browser_slots)
+    for i in range(settings.browser_slots):
+        slot = (offset + i) % settings.browser_slots
+        lock = filelock.FileLock(settings.slots_directory / f"slot-{slot}.lock")
+        try:
+            lock.acquire(timeout=0)
+        except filelock.Timeout:
+            continue
+        return lock
+
+    return None
@@ -0,0 +1,292 @@
+import re
+import json
+import sqlite3
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from logger import ScraperLog
+from settings import settings
+
+
+VOYAGE_FIELDS = (
+    "last_port_name",
+    "last_port_code",
+    "last_port_etd",
+    "next_port_name",
+    "next_port_code",
+    "next_port_date",
+    "next_port_date_status",
+)
+
+IMO_PATTERNS = [
+    re.compile(r"/imo:(\d{7})"),  # marinetraffic
+    re.compile(r"/details/(\d{7})"),  # vesselfinder
+]
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS voyages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    provider TEXT NOT NULL,
+    vessel_name TEXT NOT NULL,
+    imo TEXT,
+    url TEXT,
+    record_hash TEXT NOT NULL,
+    first_scraped_at TEXT NOT NULL,
+    last_scraped_at TEXT NOT NULL,
+    {", ".join(f"{field} TEXT" for field in VOYAGE_FIELDS)}
+);
+CREATE INDEX IF NOT EXISTS idx_voyages_provider_name
+    ON voyages (provider, vessel_name, last_scraped_at);
+CREATE INDEX IF NOT EXISTS idx_voyages_name ON voyages (vessel_name, last_scraped_at);
+CREATE INDEX IF NOT EXISTS idx_voyages_imo ON voyages (imo, last_scraped_at);
+CREATE INDEX IF NOT EXISTS idx_voyages_scraped_at ON voyages (last_scraped_at);
+CREATE TABLE IF NOT EXISTS scrape_attempts (
+    provider TEXT NOT NULL,
+    vessel_name TEXT NOT NULL,
+    attempted_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_attempts_provider_time
+    ON scrape_attempts (provider, attempted_at);
+CREATE INDEX IF NOT EXISTS idx_attempts_provider_name
+    ON scrape_attempts (provider, vessel_name, attempted_at);
+"""
+
+ATTEMPTS_RETENTION = timedelta(days=7)
+
+
+def normalize_name(name: str) -> str:
+    return " ".join(name.split()).upper()
+
+
+def extract_imo(url: str) -> Optional[str]:
+    for pattern in IMO_PATTERNS:
+        match = pattern.search(url)
+        if match:
+            return match.group(1)
+    return None
+
+
+def record_hash(record: Dict[str, Any]) -> str:
+    voyage = {field: record.get(field) for field in VOYAGE_FIELDS}
+    encoded = json.dumps(voyage, sort_keys=True).encode("utf-8")
+    return hashlib.sha1(encoded).hexdigest()
+
+
+_schema_ready = False
+
+
+def connect() -> sqlite3.Connection:
+    """Open the voyage store, creating it and its schema once per process."""
+    global _schema_ready
+    settings.store_filepath.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(settings.store_filepath, timeout=30)
+    connection.row_factory = sqlite3.Row
+    if not _schema_ready:
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(SCHEMA)
+        _schema_ready = True
+    return connection
+
+
+def connect_existing() -> Optional[sqlite3.Connection]:
+    """Open the store for reading, or None when nothing has been stored yet."""
+    if not settings.store_filepath.exists():
+        return None
+    return connect()
+
+
+def save_results(provider: str, results: List[Dict[str, Any]]) -> int:
+    """
+    Append scraped results to the store.
+
+    A record identical to the latest one stored for the same vessel only
+    bumps its `last_scraped_at`. Returns the number of new rows.
+    """
+    scraped_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    inserted = 0
+
+    connection = connect()
+    try:
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            for result in results:
+                if not result.get("url") or not result.get("search_text"):
+                    continue  # Vessel was not found, nothing to store
+
+                vessel_name = normalize_name(result["search_text"])
+                current_hash = record_hash(result)
+                latest = connection.execute(
+                    "SELECT id, record_hash FROM voyages"
+                    " WHERE provider = ? AND vessel_name = ?"
+                    " ORDER BY last_scraped_at DESC, id DESC LIMIT 1",
+                    (provider, vessel_name),
+                ).fetchone()
+
+                if latest is not None and latest["record_hash"] == current_hash:
+                    connection.execute(
+                        "UPDATE voyages SET last_scraped_at = ? WHERE id = ?",
+                        (scraped_at, latest["id"]),
+                    )
+                    continue
+
+                columns = [
+                    "provider",
+                    "vessel_name",
+                    "imo",
+                    "url",
+                    "record_hash",
+                    "first_scraped_at",
+                    "last_scraped_at",
+                    *VOYAGE_FIELDS,
+                ]
+                values = [
+                    provider,
+                    vessel_name,
+                    extract_imo(result["url"]),
+                    result["url"],
+                    current_hash,
+                    scraped_at,
+                    scraped_at,
+                    *(result.get(field) for field in VOYAGE_FIELDS),
+                ]
+                connection.execute(
+                    f"INSERT INTO voyages ({', '.join(columns)})"
+                    f" VALUES ({', '.join('?' for _ in columns)})",
+                    values,
+                )
+                inserted += 1
+    finally:
+        connection.close()
+
+    ScraperLog.debug(f"Stored {inserted} new {provider} voyage records")
+    return inserted
+
+
+def _vessel_filter(name: str, provider: Optional[str]) -> tuple[str, List[Any]]:
+    if name.isdigit() and len(name) == 7:
+        clause, params = "imo = ?", [name]
+    else:
+        clause, params = "vessel_name = ?", [normalize_name(name)]
+
+    if provider:
+        clause += " AND provider = ?"
+        params.append(provider)
+
+    return clause, params
+
+
+def get_latest(name: str, provider: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Latest stored record for a vessel name or IMO number."""
+    clause, params = _vessel_filter(name, provider)
+    connection = connect_existing()
+    if connection is None:
+        return None
+    try:
+        row = connection.execute(
+            f"SELECT * FROM voyages WHERE {clause}"
+            " ORDER BY last_scraped_at DESC, id DESC LIMIT 1",
+            params,
+        ).fetchone()
+    finally:
+        connection.close()
+
+    return dict(row) if row is not None else None
+
+
+def get_latest_by_vessel(provider: str) -> Dict[str, Dict[str, Any]]:
+    """Latest stored record of every vessel for a provider, keyed by vessel name."""
+    connection = connect_existing()
+    if connection is None:
+        return {}
+    try:
+        rows = connection.execute(
+            "SELECT * FROM voyages AS v WHERE provider = ? AND id = ("
+            " SELECT id FROM voyages"
+            " WHERE provider = v.provider AND vessel_name = v.vessel_name"
+            " ORDER BY last_scraped_at DESC, id DESC LIMIT 1)",
+            (provider,),
+        ).fetchall()
+    finally:
+        connection.close()
+
+    return {row["vessel_name"]: dict(row) for row in rows}
+
+
+def get_history(
+    name: str, provider: Optional[str] = None, since: Optional[datetime] = None
+) -> List[Dict[str, Any]]:
+    """Stored records for a vessel, newest first, optionally seen since `since`."""
+    clause, params = _vessel_filter(name, provider)
+    if since is not None:
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        clause += " AND last_scraped_at >= ?"
+        params.append(since.astimezone(timezone.utc).isoformat(timespec="seconds"))
+
+    connection = connect_existing()
+    if connection is None:
+        return []
+    try:
+        rows = connection.execute(
+            f"SELECT * FROM voyages WHERE {clause}"
+            " ORDER BY last_scraped_at DESC, id DESC",
+            params,
+        ).fetchall()
+    finally:
+        connection.close()
+
+    return [dict(row) for row in rows]
+
+
+def record_attempts(provider: str, names: List[str], attempted_at: datetime) -> None:
+    """Record scrape attempts, dropping those older than `ATTEMPTS_RETENTION`."""
+    attempted = attempted_at.isoformat(timespec="seconds")
+    expired = (attempted_at - ATTEMPTS_RETENTION).isoformat(timespec="seconds")
+
+    connection = connect()
+    try:
+        with connection:
+            connection.executemany(
+                "INSERT INTO scrape_attempts (provider, vessel_name, attempted_at)"
+                " VALUES (?, ?, ?)",
+                [(provider, normalize_name(name), attempted) for name in names],
+            )
+            connection.execute(
+                "DELETE FROM scrape_attempts WHERE attempted_at < ?", (expired,)
+            )
+    finally:
+        connection.close()
+
+
+def count_attempts(provider: str, since: datetime) -> int:
+    connection = connect_existing()
+    if connection is None:
+        return 0
+    try:
+        row = connection.execute(
+            "SELECT COUNT(*) FROM scrape_attempts"
+            " WHERE provider = ? AND attempted_at > ?",
+            (provider, since.isoformat(timespec="seconds")),
+        ).fetchone()
+    finally:
+        connection.close()
+
+    return int(row[0])
+
+
+def get_last_attempts(provider: str) -> Dict[str, datetime]:
+    """Latest scrape attempt of every vessel for a provider, keyed by vessel name."""
+    connection = connect_existing()
+    if connection is None:
+        return {}
+    try:
+        rows = connection.execute(
+            "SELECT vessel_name, MAX(attempted_at) FROM scrape_attempts"
+            " WHERE provider = ? GROUP BY vessel_name",
+            (provider,),
+        ).fetchall()
+    finally:
+        connection.close()
+
+    return {row[0]: datetime.fromisoformat(row[1]) for row in rows}
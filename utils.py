@@ -1,10 +1,15 @@
 import csv
 from pathlib import Path
 import time
-from typing import Any, List
+from datetime import datetime, timezone
+from typing import Any, List, Optional
 
 from logger import ScraperLog
 
+# Format of vesselfinder's `convert_time_format` timestamps, in UTC.
+# marinetraffic's carry the port's UTC offset, e.g. `2025-01-29 22:00+05:00`.
+SCRAPED_TIME_FORMAT = "%Y-%m-%d %H:%M"
+
 
 def get_search_terms(filepath: Path) -> List[str]:
     with filepath.open(newline="", encoding="utf-8") as file:
@@ -14,6 +19,19 @@ def get_search_terms(filepath: Path) -> List[str]:
     return first_column[1:]
 
 
+def parse_scraped_time(value: Optional[str]) -> Optional[datetime]:
+    """Parse a scraped timestamp into an aware UTC datetime; no offset means UTC."""
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
 def timetracker(func: Any) -> Any:
     def wrapper(*args: Any, **kwargs: Any) -> Any:
         start_time = time.time()
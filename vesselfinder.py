@@ -10,8 +10,12 @@ from botasaurus.browser import browser, Driver
 from botasaurus.soupify import soupify
 from botasaurus.user_agent import UserAgent
 
+import network
+import ports
+import store
 from logger import ScraperLog
 from settings import settings
+from utils import SCRAPED_TIME_FORMAT
 
 
 js_script = """
@@ -48,10 +52,23 @@ def convert_time_format(datetime_str: str) -> str:
 
     date_part, time_part = match.groups()
 
-    dt = datetime.strptime(f"{date_part}, {time_part}", "%b %d, %H:%M")
-    dt = dt.replace(year=datetime.now(timezone.utc).year)
+    # The page shows no year: pick the one that puts the date closest to now,
+    # so a January ETA scraped in December lands in the next year.
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    candidates = []
+    for year in (now.year - 1, now.year, now.year + 1):
+        try:
+            candidates.append(
+                datetime.strptime(f"{date_part} {year}, {time_part}", "%b %d %Y, %H:%M")
+            )
+        except ValueError:  # 29 February outside a leap year
+            continue
+    if not candidates:
+        ScraperLog.info(f"Date not valid in any nearby year: {datetime_str}")
+        return ""
+    dt = min(candidates, key=lambda candidate: abs(candidate - now))
 
-    return dt.strftime("%Y-%m-%d %H:%M")
+    return dt.strftime(SCRAPED_TIME_FORMAT)
 
 
 @browser(
@@ -66,28 +83,32 @@ def convert_time_format(datetime_str: str) -> str:
     headless=settings.headless,
     user_agent=UserAgent.RANDOM,
 )  # type: ignore
-def scrape_html(driver: Driver, data: Dict[str, Any]) -> Tuple[str, str]:
+def scrape_html(
+    driver: Driver, data: Dict[str, Any]
+) -> Tuple[str, str, Dict[str, int]]:
     detail_page_url = ""
     link = data["link"]
     search_text = data["search_text"]
     wait_time = 5
     sleep_time = 2
+    stats = network.track(driver, settings.vesselfinder_blocked_urls)
 
     if driver.config.is_new:
         ScraperLog.debug(f"Opening new driver for search term {search_text}")
         driver.get(link)
         time.sleep(sleep_time)
 
-        btns = driver.select_all(".qc-cmp2-footer button", wait=wait_time)
-        clicked = False
-        for btn in btns:
-            if btn.text.lower() == "agree":
-                btn.click()
-                clicked = True
-                break
+        if settings.vesselfinder_accept_consent:
+            btns = driver.select_all(".qc-cmp2-footer button", wait=wait_time)
+            clicked = False
+            for btn in btns:
+                if btn.text.lower() == "agree":
+                    btn.click()
+                    clicked = True
+                    break
 
-        if clicked:
-            time.sleep(sleep_time // 2)
+            if clicked:
+                time.sleep(sleep_time // 2)
 
     response_data = driver.run_js(js_script, search_text)
     results = response_data.get("list", [])
@@ -116,12 +137,12 @@ def scrape_html(driver: Driver, data: Dict[str, Any]) -> Tuple[str, str]:
             ScraperLog.debug(f"Saved screenshot to {filename}")
             ScraperLog.debug(f"Other Options: {results}")
             driver.reload()
-            return "", detail_page_url
+            return "", detail_page_url, network.report(stats, search_text)
 
     time.sleep(sleep_time)
 
     html: str = driver.page_html
-    return html, detail_page_url
+    return html, detail_page_url, network.report(stats, search_text)
 
 
 def extract_data(soup: BeautifulSoup) -> Dict[str, Any]:
@@ -184,6 +205,7 @@ def write_to_file(data: List[Dict[str, Any]], result: List[Dict[str, Any]]) -> N
     settings.output_dir.mkdir(parents=True, exist_ok=True)
 
     bt.write_json(result, settings.output_dir / "vesselfinder.json")
+    store.save_results("vesselfinder", result)
 
 
 @task(
@@ -197,10 +219,14 @@ def write_to_file(data: List[Dict[str, Any]], result: List[Dict[str, Any]]) -> N
 def scrape_data(data: Dict[str, Any]) -> Dict[str, Any]:
     search_text = data["search_text"]
     ScraperLog.info(f"Scraping vesselfinder for {search_text}")
-    html, detail_page_url = scrape_html(data)
+    html, detail_page_url, network_stats = scrape_html(data)
     if html == "":
-        return {}
-    return {**extract_data(soupify(html)), "url": detail_page_url}
+        return {"network": network_stats}
+    return {
+        **ports.enrich(extract_data(soupify(html))),
+        "url": detail_page_url,
+        "network": network_stats,
+    }
 
 
 def scrape_vesselfinder(data: List[Dict[str, str]]) -> List[Dict[str, Any]]: